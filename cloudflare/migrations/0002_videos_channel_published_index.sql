@@ -0,0 +1,4 @@
+-- Composite index backing per-channel video listings ordered by publish date.
+-- Supersedes idx_videos_channel_id (channel_id is its leftmost column).
+CREATE INDEX IF NOT EXISTS idx_videos_channel_published ON videos(channel_id, published_at DESC);
+DROP INDEX IF EXISTS idx_videos_channel_id;
@@ -37,6 +37,6 @@ CREATE TABLE IF NOT EXISTS chunks (
 );
 
 -- Indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_videos_channel_id ON videos(channel_id);
+CREATE INDEX IF NOT EXISTS idx_videos_channel_published ON videos(channel_id, published_at DESC);
 CREATE INDEX IF NOT EXISTS idx_chunks_video_id ON chunks(video_id);
 CREATE INDEX IF NOT EXISTS idx_chunks_vectorize_id ON chunks(vectorize_id);
@@ -13,7 +13,7 @@ import {
   getVideoChunks,
   deleteVideo,
 } from './db';
-import { generateEmbeddings, upsertVectors, deleteVectors } from './vectorize';
+import { chunkEmbeddingText, generateEmbeddings, upsertVectors, deleteVectors } from './vectorize';
 
 /**
  * Handle POST /api/index - Index new content from the local CLI
@@ -88,7 +88,7 @@ export async function handleIndexRequest(
     }
 
     // Generate embeddings for all chunk texts in batch
-    const texts = chunkInfos.map((info) => info.text);
+    const texts = chunkInfos.map((info) => chunkEmbeddingText(body.video.title, info.text));
     const embeddings = await generateEmbeddings(env.AI, texts);
 
     // Prepare vectors for batch upsert
@@ -5,13 +5,24 @@
 import type { ChannelRow, VideoRow, ChunkRow } from './types';
 
 /**
- * Insert or update a channel. Sets indexed_at to current ISO timestamp.
+ * Chunk fields supplied when inserting a new chunk.
  */
-export async function upsertChannel(
+type NewChunk = {
+  video_id: string;
+  seq: number;
+  start_time: number;
+  end_time: number;
+  text: string;
+};
+
+/**
+ * Build the channel upsert statement. Sets indexed_at to current ISO timestamp.
+ */
+function upsertChannelStatement(
   db: D1Database,
   channel: { id: string; name: string; url: string }
-): Promise<void> {
-  await db
+): D1PreparedStatement {
+  return db
     .prepare(
       `INSERT INTO channels (id, name, url, indexed_at)
        VALUES (?, ?, ?, ?)
@@ -20,8 +31,17 @@ export async function upsertChannel(
          url = excluded.url,
          indexed_at = excluded.indexed_at`
     )
-    .bind(channel.id, channel.name, channel.url, new Date().toISOString())
-    .run();
+    .bind(channel.id, channel.name, channel.url, new Date().toISOString());
+}
+
+/**
+ * Insert or update a channel. Sets indexed_at to current ISO timestamp.
+ */
+export async function upsertChannel(
+  db: D1Database,
+  channel: { id: string; name: string; url: string }
+): Promise<void> {
+  await upsertChannelStatement(db, channel).run();
 }
 
 /**
@@ -49,13 +69,10 @@ export async function getChannel(
 }
 
 /**
- * Insert or update a video.
+ * Build the video upsert statement.
  */
-export async function upsertVideo(
-  db: D1Database,
-  video: VideoRow
-): Promise<void> {
-  await db
+function upsertVideoStatement(db: D1Database, video: VideoRow): D1PreparedStatement {
+  return db
     .prepare(
       `INSERT INTO videos (id, channel_id, title, description, duration, published_at, thumbnail_url, transcript_source, r2_video_key, r2_transcript_key)
        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -81,8 +98,17 @@ export async function upsertVideo(
       video.transcript_source,
       video.r2_video_key,
       video.r2_transcript_key
-    )
-    .run();
+    );
+}
+
+/**
+ * Insert or update a video.
+ */
+export async function upsertVideo(
+  db: D1Database,
+  video: VideoRow
+): Promise<void> {
+  await upsertVideoStatement(db, video).run();
 }
 
 /**
@@ -99,6 +125,25 @@ export async function getVideo(
   return result;
 }
 
+/**
+ * Get a video together with its channel's name in a single query.
+ */
+export async function getVideoWithChannel(
+  db: D1Database,
+  id: string
+): Promise<(VideoRow & { channel_name: string | null }) | null> {
+  const result = await db
+    .prepare(
+      `SELECT videos.*, channels.name AS channel_name
+       FROM videos
+       LEFT JOIN channels ON channels.id = videos.channel_id
+       WHERE videos.id = ?`
+    )
+    .bind(id)
+    .first<VideoRow & { channel_name: string | null }>();
+  return result;
+}
+
 /**
  * List videos, optionally filtered by channel_id, ordered by published_at DESC.
  */
@@ -122,19 +167,10 @@ export async function listVideos(
 }
 
 /**
- * Insert a chunk and return the auto-generated id.
+ * Build the chunk insert statement, returning the auto-generated id.
  */
-export async function insertChunk(
-  db: D1Database,
-  chunk: {
-    video_id: string;
-    seq: number;
-    start_time: number;
-    end_time: number;
-    text: string;
-  }
-): Promise<number> {
-  const result = await db
+function insertChunkStatement(db: D1Database, chunk: NewChunk): D1PreparedStatement {
+  return db
     .prepare(
       `INSERT INTO chunks (video_id, seq, start_time, end_time, text)
        VALUES (?, ?, ?, ?, ?)
@@ -146,8 +182,30 @@ export async function insertChunk(
       chunk.start_time,
       chunk.end_time,
       chunk.text
-    )
-    .first<{ id: number }>();
+    );
+}
+
+/**
+ * Extract the inserted chunk ids from batch results, in statement order.
+ */
+function collectChunkIds(results: D1Result<{ id: number }>[]): number[] {
+  return results.map((result) => {
+    const row = result.results[0];
+    if (!row) {
+      throw new Error('Failed to insert chunk: no id returned');
+    }
+    return row.id;
+  });
+}
+
+/**
+ * Insert a chunk and return the auto-generated id.
+ */
+export async function insertChunk(
+  db: D1Database,
+  chunk: NewChunk
+): Promise<number> {
+  const result = await insertChunkStatement(db, chunk).first<{ id: number }>();
 
   if (!result) {
     throw new Error('Failed to insert chunk: no id returned');
@@ -155,6 +213,31 @@ export async function insertChunk(
   return result.id;
 }
 
+/**
+ * Upsert a channel and video and insert the video's chunks in a single batch,
+ * so the whole write commits as one transaction. Each insert is followed by
+ * an UPDATE that sets that row's vectorize_id to `chunk_<id>`.
+ * Returns the chunks' vectorize_ids in input order.
+ */
+export async function saveVideoWithChunks(
+  db: D1Database,
+  channel: { id: string; name: string; url: string },
+  video: VideoRow,
+  chunks: NewChunk[]
+): Promise<string[]> {
+  const results = await db.batch<{ id: number }>([
+    upsertChannelStatement(db, channel),
+    upsertVideoStatement(db, video),
+    ...chunks.flatMap((chunk) => [
+      insertChunkStatement(db, chunk),
+      db.prepare(`UPDATE chunks SET vectorize_id = 'chunk_' || id WHERE id = last_insert_rowid()`),
+    ]),
+  ]);
+  // Results alternate insert, update after the channel and video upserts
+  const insertResults = results.slice(2).filter((_, i) => i % 2 === 0);
+  return collectChunkIds(insertResults).map((id) => `chunk_${id}`);
+}
+
 /**
  * Update a chunk's vectorize_id field.
  */
@@ -225,6 +308,20 @@ export async function getVideoChunks(
   return result.results;
 }
 
+/**
+ * Get the vectorize_ids of all chunks for a video.
+ */
+export async function getVideoVectorizeIds(
+  db: D1Database,
+  videoId: string
+): Promise<string[]> {
+  const result = await db
+    .prepare('SELECT vectorize_id FROM chunks WHERE video_id = ? AND vectorize_id IS NOT NULL')
+    .bind(videoId)
+    .all<{ vectorize_id: string | null }>();
+  return collectVectorizeIds(result.results);
+}
+
 /**
  * Delete all chunks for a video.
  */
@@ -238,6 +335,30 @@ export async function deleteVideoChunks(
     .run();
 }
 
+/**
+ * Delete a video and all of its chunks in a single batch (one transaction).
+ * Delete the chunks' vectors first (see getVideoVectorizeIds): once these
+ * rows are gone nothing records which vectors belonged to the video.
+ */
+export async function deleteVideoWithChunks(
+  db: D1Database,
+  videoId: string
+): Promise<void> {
+  await db.batch([
+    db.prepare('DELETE FROM chunks WHERE video_id = ?').bind(videoId),
+    db.prepare('DELETE FROM videos WHERE id = ?').bind(videoId),
+  ]);
+}
+
+/**
+ * Extract the non-null vectorize_ids from chunk rows.
+ */
+function collectVectorizeIds(rows: { vectorize_id: string | null }[]): string[] {
+  return rows
+    .map((c) => c.vectorize_id)
+    .filter((id): id is string => id !== null);
+}
+
 /**
  * Delete a video by ID.
  */
@@ -257,15 +378,18 @@ export async function deleteVideo(
 export async function getStats(
   db: D1Database
 ): Promise<{ channels: number; videos: number; chunks: number }> {
-  const [channelsResult, videosResult, chunksResult] = await Promise.all([
-    db.prepare('SELECT COUNT(*) AS count FROM channels').first<{ count: number }>(),
-    db.prepare('SELECT COUNT(*) AS count FROM videos').first<{ count: number }>(),
-    db.prepare('SELECT COUNT(*) AS count FROM chunks').first<{ count: number }>(),
-  ]);
+  const result = await db
+    .prepare(
+      `SELECT
+         (SELECT COUNT(*) FROM channels) AS channels,
+         (SELECT COUNT(*) FROM videos) AS videos,
+         (SELECT COUNT(*) FROM chunks) AS chunks`
+    )
+    .first<{ channels: number; videos: number; chunks: number }>();
 
   return {
-    channels: channelsResult?.count ?? 0,
-    videos: videosResult?.count ?? 0,
-    chunks: chunksResult?.count ?? 0,
+    channels: result?.channels ?? 0,
+    videos: result?.videos ?? 0,
+    chunks: result?.chunks ?? 0,
   };
 }
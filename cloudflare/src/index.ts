@@ -5,16 +5,15 @@
 
 import type { Env, IndexRequest } from './types';
 import {
-  upsertChannel,
-  upsertVideo,
-  insertChunk,
-  updateChunkVectorizeId,
-  deleteVideoChunks,
+  saveVideoWithChunks,
+  deleteVideoWithChunks,
   getVideo,
+  getVideoVectorizeIds,
   getStats,
   listChannels,
 } from './db';
 import {
+  chunkEmbeddingText,
   generateEmbeddings,
   upsertVectors,
   deleteVectors,
@@ -63,6 +62,10 @@ const OPENAI_RESOURCE_META = {
   'openai/widgetCSP': OPENAI_WIDGET_CSP,
 };
 
+// Transcripts processed in parallel by /api/admin/dedupe-transcripts
+// (Workers allow six simultaneous open connections per request)
+const DEDUPE_CONCURRENCY = 6;
+
 // Video resource URI prefix
 const VIDEO_URI_PREFIX = 'video://clip/';
 // Transcript resource URI prefix
@@ -251,48 +254,41 @@ async function handleIndexRequest(request: Request, env: Env): Promise<Response>
       return errorResponse('Missing required fields: channel, video, chunks', 400);
     }
 
-    // Upsert channel
-    await upsertChannel(env.DB, body.channel);
-
-    // Upsert video
-    await upsertVideo(env.DB, {
-      id: body.video.id,
-      channel_id: body.channel.id,
-      title: body.video.title,
-      description: body.video.description ?? null,
-      duration: body.video.duration ?? null,
-      published_at: body.video.published_at ?? null,
-      thumbnail_url: body.video.thumbnail_url ?? null,
-      transcript_source: body.video.transcript_source,
-      r2_video_key: body.r2_video_key ?? null,
-      r2_transcript_key: body.r2_transcript_key ?? null,
-    });
-
-    // Insert chunks and generate embeddings
-    const chunkTexts = body.chunks.map((c) => c.text);
+    // Generate embeddings before writing anything, so a failure leaves D1 untouched
+    const chunkTexts = body.chunks.map((c) => chunkEmbeddingText(body.video.title, c.text));
     const embeddings = await generateEmbeddings(env.AI, chunkTexts);
 
-    const vectorsToUpsert: Array<{ id: string; embedding: number[]; metadata?: Record<string, string> }> = [];
-
-    for (let i = 0; i < body.chunks.length; i++) {
-      const chunk = body.chunks[i];
-      const chunkId = await insertChunk(env.DB, {
+    // Upsert channel and video, insert chunks and assign their vectorize_ids in one transaction
+    const vectorizeIds = await saveVideoWithChunks(
+      env.DB,
+      body.channel,
+      {
+        id: body.video.id,
+        channel_id: body.channel.id,
+        title: body.video.title,
+        description: body.video.description ?? null,
+        duration: body.video.duration ?? null,
+        published_at: body.video.published_at ?? null,
+        thumbnail_url: body.video.thumbnail_url ?? null,
+        transcript_source: body.video.transcript_source,
+        r2_video_key: body.r2_video_key ?? null,
+        r2_transcript_key: body.r2_transcript_key ?? null,
+      },
+      body.chunks.map((chunk) => ({
         video_id: body.video.id,
         seq: chunk.seq,
         start_time: chunk.start_time,
         end_time: chunk.end_time,
         text: chunk.text,
-      });
-
-      const vectorizeId = `chunk_${chunkId}`;
-      await updateChunkVectorizeId(env.DB, chunkId, vectorizeId);
+      }))
+    );
 
-      vectorsToUpsert.push({
+    const vectorsToUpsert: Array<{ id: string; embedding: number[]; metadata?: Record<string, string> }> =
+      vectorizeIds.map((vectorizeId, i) => ({
         id: vectorizeId,
         embedding: embeddings[i],
         metadata: { video_id: body.video.id },
-      });
-    }
+      }));
 
     // Batch upsert vectors
     await upsertVectors(env.VECTORIZE, vectorsToUpsert);
@@ -321,26 +317,15 @@ async function handleDeleteVideo(videoId: string, env: Env): Promise<Response> {
       return errorResponse('Video not found', 404);
     }
 
-    // Get all chunk vectorize_ids for this video to delete from Vectorize
-    const chunksResult = await env.DB
-      .prepare('SELECT vectorize_id FROM chunks WHERE video_id = ?')
-      .bind(videoId)
-      .all<{ vectorize_id: string | null }>();
-
-    const vectorizeIds = chunksResult.results
-      .map((c) => c.vectorize_id)
-      .filter((id): id is string => id !== null);
-
-    // Delete from Vectorize
+    // Delete from Vectorize first: if it fails, the D1 rows still hold the
+    // vectorize_ids, so the request can be retried
+    const vectorizeIds = await getVideoVectorizeIds(env.DB, videoId);
     if (vectorizeIds.length > 0) {
       await deleteVectors(env.VECTORIZE, vectorizeIds);
     }
 
-    // Delete chunks from D1
-    await deleteVideoChunks(env.DB, videoId);
-
-    // Delete video from D1
-    await env.DB.prepare('DELETE FROM videos WHERE id = ?').bind(videoId).run();
+    // Then delete chunks and video from D1 in one batch
+    await deleteVideoWithChunks(env.DB, videoId);
 
     // Delete from R2 if keys exist
     if (video.r2_video_key) {
@@ -426,35 +411,51 @@ async function handleDedupeTranscripts(request: Request, env: Env): Promise<Resp
       .prepare('SELECT id, r2_transcript_key FROM videos WHERE r2_transcript_key IS NOT NULL')
       .all<{ id: string; r2_transcript_key: string }>();
 
-    const results: Array<{ videoId: string; before: number; after: number }> = [];
+    // Per-video outcomes, kept in query order regardless of completion order
+    const outcomes: Array<{ videoId: string; before: number; after: number } | null> =
+      new Array(videos.results.length).fill(null);
     let updated = 0;
     let totalRemoved = 0;
-
-    for (const video of videos.results) {
-      const obj = await env.R2.get(video.r2_transcript_key);
-      if (!obj) continue;
-
-      const text = await obj.text();
-      const segments = JSON.parse(text) as Array<{ text: string; start_time: number; end_time: number }>;
-      const deduped = dedupeSegments(segments);
-
-      if (deduped.length < segments.length) {
-        const removed = segments.length - deduped.length;
-        totalRemoved += removed;
-        results.push({
-          videoId: video.id,
-          before: segments.length,
-          after: deduped.length,
-        });
-
-        if (!dryRun) {
-          await env.R2.put(video.r2_transcript_key, JSON.stringify(deduped), {
-            httpMetadata: { contentType: 'application/json' },
-          });
-          updated++;
+    let nextIndex = 0;
+
+    // Fetch and rewrite transcripts a few at a time instead of one after another
+    const worker = async () => {
+      while (nextIndex < videos.results.length) {
+        const index = nextIndex++;
+        const video = videos.results[index];
+
+        const obj = await env.R2.get(video.r2_transcript_key);
+        if (!obj) continue;
+
+        const text = await obj.text();
+        const segments = JSON.parse(text) as Array<{ text: string; start_time: number; end_time: number }>;
+        const deduped = dedupeSegments(segments);
+
+        if (deduped.length < segments.length) {
+          const removed = segments.length - deduped.length;
+          totalRemoved += removed;
+          outcomes[index] = {
+            videoId: video.id,
+            before: segments.length,
+            after: deduped.length,
+          };
+
+          if (!dryRun) {
+            await env.R2.put(video.r2_transcript_key, JSON.stringify(deduped), {
+              httpMetadata: { contentType: 'application/json' },
+            });
+            updated++;
+          }
         }
       }
-    }
+    };
+
+    await Promise.all(
+      Array.from({ length: Math.min(DEDUPE_CONCURRENCY, videos.results.length) }, worker)
+    );
+    const results = outcomes.filter(
+      (outcome): outcome is { videoId: string; before: number; after: number } => outcome !== null
+    );
 
     return jsonResponse({
       dryRun,
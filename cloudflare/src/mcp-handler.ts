@@ -4,8 +4,8 @@
  */
 
 import type { Env, ChannelRow, SearchResult } from './types';
-import { listChannels, getChunksByVectorizeIds, getStats as getDbStats, getVideo, getChannel, getVideoChunks } from './db';
-import { generateEmbedding, searchVectors } from './vectorize';
+import { listChannels, getChunksByVectorizeIds, getStats as getDbStats, getVideoWithChannel, getVideoChunks } from './db';
+import { generateQueryEmbedding, searchVectors } from './vectorize';
 
 // Constants
 const TRANSCRIPT_RESOURCE_PREFIX = 'transcript://';
@@ -87,8 +87,8 @@ export async function searchTranscripts(
   limit: number = 5,
   baseUrl?: string
 ): Promise<{ content: Array<{ type: string; text: string }>; structuredContent: { query: string; results: FormattedSearchResult[] } }> {
-  // Generate embedding for the query using Workers AI
-  const queryEmbedding = await generateEmbedding(env.AI, query);
+  // Generate embedding for the query using Workers AI (cached for repeated queries)
+  const queryEmbedding = await generateQueryEmbedding(env.AI, query);
 
   // Search Vectorize for similar vectors
   const vectorMatches = await searchVectors(env.VECTORIZE, queryEmbedding, limit);
@@ -133,10 +133,14 @@ export async function searchTranscripts(
       ? `${baseUrl}/video/${chunk.video_id}`
       : undefined;
 
+    // Chunks indexed before titles moved out of chunk text start with "<title> | "
+    const titlePrefix = `${chunk.video_title} | `;
+    const text = chunk.text.startsWith(titlePrefix) ? chunk.text.slice(titlePrefix.length) : chunk.text;
+
     results.push({
       chunk_id: chunk.id,
       score,
-      text: chunk.text,
+      text,
       start_time: startTime,
       end_time: endTime,
       video_id: chunk.video_id,
@@ -160,12 +164,6 @@ export async function searchTranscripts(
     const timestamp = formatTimestamp(r.start_time ?? 0);
     const scorePct = r.score * 100;
 
-    // Clean text - remove title prefix if present
-    let text = r.text;
-    if (text.includes('|')) {
-      text = text.split('|').slice(1).join('|').trim();
-    }
-
     output += `**Result ${i + 1}** (Score: ${scorePct.toFixed(1)}%)\n`;
     output += `- Video: ${r.video_title}\n`;
     output += `- Channel: ${r.channel_name}\n`;
@@ -175,7 +173,7 @@ export async function searchTranscripts(
     if (r.cloudflare_video_url) {
       output += `- Video URL: ${r.cloudflare_video_url}\n`;
     }
-    output += `- Excerpt: ${text.slice(0, 300)}${text.length > 300 ? '...' : ''}\n\n`;
+    output += `- Excerpt: ${r.text.slice(0, 300)}${r.text.length > 300 ? '...' : ''}\n\n`;
   }
 
   output += `---\n**To display a video to the user, use the \`show_video\` tool with the video_id and start_time.**`;
@@ -270,13 +268,12 @@ export async function showVideo(
   reason?: string,
   baseUrl?: string
 ): Promise<{ content: Array<{ type: string; text: string }>; structuredContent: ShowVideoResult }> {
-  const video = await getVideo(env.DB, videoId);
+  const video = await getVideoWithChannel(env.DB, videoId);
   if (!video) {
     throw new Error(`Video not found: ${videoId}`);
   }
 
-  const channel = await getChannel(env.DB, video.channel_id);
-  const channelName = channel?.name ?? 'Unknown Channel';
+  const channelName = video.channel_name ?? 'Unknown Channel';
 
   const videoUrl = baseUrl
     ? `${baseUrl}/video/${encodeURIComponent(videoId)}`
@@ -324,13 +321,11 @@ export async function getVideoTranscript(
   env: Env,
   videoId: string
 ): Promise<TranscriptData> {
-  const video = await getVideo(env.DB, videoId);
+  const video = await getVideoWithChannel(env.DB, videoId);
   if (!video) {
     throw new Error(`Video not found: ${videoId}`);
   }
 
-  const channel = await getChannel(env.DB, video.channel_id);
-
   // Try to fetch granular transcript from R2 first
   if (video.r2_transcript_key) {
     try {
@@ -349,7 +344,7 @@ export async function getVideoTranscript(
         return {
           video_id: videoId,
           video_title: video.title,
-          channel_name: channel?.name ?? 'Unknown Channel',
+          channel_name: video.channel_name ?? 'Unknown Channel',
           segments: dedupedSegments,
         };
       }
@@ -364,7 +359,7 @@ export async function getVideoTranscript(
   return {
     video_id: videoId,
     video_title: video.title,
-    channel_name: channel?.name ?? 'Unknown Channel',
+    channel_name: video.channel_name ?? 'Unknown Channel',
     segments: chunks.map((chunk) => ({
       start_time: chunk.start_time ?? 0,
       end_time: chunk.end_time ?? 0,
@@ -6,13 +6,17 @@ import {
   listChannels,
   upsertVideo,
   getVideo,
+  getVideoWithChannel,
   listVideos,
   insertChunk,
   updateChunkVectorizeId,
   getChunksByVectorizeIds,
   getVideoChunks,
+  getVideoVectorizeIds,
   deleteVideoChunks,
   deleteVideo,
+  deleteVideoWithChunks,
+  saveVideoWithChunks,
   getStats,
 } from "../db";
 
@@ -118,6 +122,28 @@ describe("D1 Database Operations", () => {
       expect(v!.r2_transcript_key).toBe("transcripts/__test__vid_1.json");
     });
 
+    it("getVideoWithChannel joins the channel name", async () => {
+      await upsertVideo(env.DB, {
+        id: "__test__vid_joined",
+        channel_id: "__test__ch_vid",
+        title: "Joined Video",
+        description: null,
+        duration: null,
+        published_at: null,
+        thumbnail_url: null,
+        transcript_source: "youtube",
+        r2_video_key: null,
+        r2_transcript_key: null,
+      });
+
+      const v = await getVideoWithChannel(env.DB, "__test__vid_joined");
+      expect(v).not.toBeNull();
+      expect(v!.title).toBe("Joined Video");
+      expect(v!.channel_name).toBe("Video Test Channel");
+
+      expect(await getVideoWithChannel(env.DB, "__test__nonexistent")).toBeNull();
+    });
+
     it("listVideos returns all videos", async () => {
       // Each test has isolated storage, so insert both videos here
       await upsertVideo(env.DB, {
@@ -304,6 +330,122 @@ describe("D1 Database Operations", () => {
       const after = await getVideoChunks(env.DB, "__test__vid_chunk");
       expect(after.length).toBe(0);
     });
+
+    it("getVideoVectorizeIds returns ids without deleting chunks", async () => {
+      await deleteVideoChunks(env.DB, "__test__vid_chunk");
+      const id1 = await insertChunk(env.DB, {
+        video_id: "__test__vid_chunk",
+        seq: 0,
+        start_time: 0,
+        end_time: 5,
+        text: "Indexed chunk.",
+      });
+      await insertChunk(env.DB, {
+        video_id: "__test__vid_chunk",
+        seq: 1,
+        start_time: 5,
+        end_time: 10,
+        text: "Unindexed chunk.",
+      });
+      await updateChunkVectorizeId(env.DB, id1, `chunk_${id1}`);
+
+      const ids = await getVideoVectorizeIds(env.DB, "__test__vid_chunk");
+      expect(ids).toEqual([`chunk_${id1}`]);
+
+      const chunks = await getVideoChunks(env.DB, "__test__vid_chunk");
+      expect(chunks.length).toBe(2);
+    });
+  });
+
+  describe("saveVideoWithChunks", () => {
+    it("writes the channel, video and chunks and assigns vectorize_ids", async () => {
+      const ids = await saveVideoWithChunks(
+        env.DB,
+        {
+          id: "__test__ch_save",
+          name: "Save Test Channel",
+          url: "https://youtube.com/@savetest",
+        },
+        {
+          id: "__test__vid_save",
+          channel_id: "__test__ch_save",
+          title: "Saved In One Batch",
+          description: null,
+          duration: null,
+          published_at: null,
+          thumbnail_url: null,
+          transcript_source: "youtube",
+          r2_video_key: null,
+          r2_transcript_key: null,
+        },
+        [0, 1, 2].map((i) => ({
+          video_id: "__test__vid_save",
+          seq: i,
+          start_time: i * 10,
+          end_time: (i + 1) * 10,
+          text: `Saved chunk ${i}.`,
+        }))
+      );
+
+      expect(ids).toHaveLength(3);
+      expect(await getChannel(env.DB, "__test__ch_save")).not.toBeNull();
+      expect((await getVideo(env.DB, "__test__vid_save"))?.title).toBe("Saved In One Batch");
+
+      const chunks = await getVideoChunks(env.DB, "__test__vid_save");
+      expect(chunks.map((c) => c.vectorize_id)).toEqual(ids);
+      expect(ids).toEqual(chunks.map((c) => `chunk_${c.id}`));
+      expect(chunks.map((c) => c.text)).toEqual([
+        "Saved chunk 0.",
+        "Saved chunk 1.",
+        "Saved chunk 2.",
+      ]);
+    });
+
+    it("leaves earlier chunks without vectors unassigned", async () => {
+      const channel = {
+        id: "__test__ch_save",
+        name: "Save Test Channel",
+        url: "https://youtube.com/@savetest",
+      };
+      const video = {
+        id: "__test__vid_save_stale",
+        channel_id: "__test__ch_save",
+        title: "Has A Stale Chunk",
+        description: null,
+        duration: null,
+        published_at: null,
+        thumbnail_url: null,
+        transcript_source: "youtube",
+        r2_video_key: null,
+        r2_transcript_key: null,
+      };
+      await upsertChannel(env.DB, channel);
+      await upsertVideo(env.DB, video);
+      const staleId = await insertChunk(env.DB, {
+        video_id: "__test__vid_save_stale",
+        seq: 0,
+        start_time: 0,
+        end_time: 10,
+        text: "Written without a vector.",
+      });
+
+      const ids = await saveVideoWithChunks(
+        env.DB,
+        channel,
+        video,
+        [1, 2].map((i) => ({
+          video_id: "__test__vid_save_stale",
+          seq: i,
+          start_time: i * 10,
+          end_time: (i + 1) * 10,
+          text: `Fresh chunk ${i}.`,
+        }))
+      );
+
+      const chunks = await getVideoChunks(env.DB, "__test__vid_save_stale");
+      expect(chunks.find((c) => c.id === staleId)?.vectorize_id).toBeNull();
+      expect(chunks.filter((c) => c.id !== staleId).map((c) => c.vectorize_id)).toEqual(ids);
+    });
   });
 
   // --- Delete video ---
@@ -336,6 +478,46 @@ describe("D1 Database Operations", () => {
       const after = await getVideo(env.DB, "__test__vid_del");
       expect(after).toBeNull();
     });
+
+    it("deleteVideoWithChunks removes the video and its chunks", async () => {
+      await upsertChannel(env.DB, {
+        id: "__test__ch_del",
+        name: "Delete Test Channel",
+        url: "https://youtube.com/@deltest",
+      });
+      await upsertVideo(env.DB, {
+        id: "__test__vid_del_all",
+        channel_id: "__test__ch_del",
+        title: "To Be Deleted With Chunks",
+        description: null,
+        duration: null,
+        published_at: null,
+        thumbnail_url: null,
+        transcript_source: "youtube",
+        r2_video_key: null,
+        r2_transcript_key: null,
+      });
+      const ids: number[] = [];
+      for (const i of [0, 1]) {
+        const id = await insertChunk(env.DB, {
+          video_id: "__test__vid_del_all",
+          seq: i,
+          start_time: i * 10,
+          end_time: (i + 1) * 10,
+          text: `Doomed chunk ${i}.`,
+        });
+        await updateChunkVectorizeId(env.DB, id, `chunk_${id}`);
+        ids.push(id);
+      }
+
+      const vectorizeIds = await getVideoVectorizeIds(env.DB, "__test__vid_del_all");
+      expect(vectorizeIds.sort()).toEqual(ids.map((id) => `chunk_${id}`).sort());
+
+      await deleteVideoWithChunks(env.DB, "__test__vid_del_all");
+
+      expect(await getVideo(env.DB, "__test__vid_del_all")).toBeNull();
+      expect(await getVideoChunks(env.DB, "__test__vid_del_all")).toEqual([]);
+    });
   });
 
   // --- Stats ---
@@ -1,11 +1,12 @@
 import { describe, it, expect, beforeAll, vi } from "vitest";
 import { env, SELF, applyD1Migrations } from "cloudflare:test";
 
-vi.mock("../vectorize", async () => {
+vi.mock("../vectorize", async (importOriginal) => {
+  const { chunkEmbeddingText } = await importOriginal<typeof import("../vectorize")>();
   const { createVectorizeModuleMock } = await import(
     "./vectorize-test-helpers"
   );
-  return createVectorizeModuleMock();
+  return { ...createVectorizeModuleMock(), chunkEmbeddingText };
 });
 
 const TEST_CHANNEL = {
@@ -168,6 +169,53 @@ describe("Integration: Full HTTP Flow", () => {
     expect(videosBody2).not.toContain(TEST_VIDEO_ID);
   });
 
+  it("search result text excludes the video title", async () => {
+    const title = "Integration Test: Title Prefixes";
+    const indexRes = await SELF.fetch("http://localhost/api/index", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        channel: TEST_CHANNEL,
+        video: {
+          id: "__test__int_prefix_vid",
+          title,
+          transcript_source: "youtube",
+        },
+        chunks: [
+          { seq: 0, start_time: 0, end_time: 30, text: "New chunks are stored without a title." },
+          { seq: 1, start_time: 30, end_time: 60, text: "Costs | benefits of caching are easy to measure." },
+          { seq: 2, start_time: 60, end_time: 90, text: "Legacy excerpt | with a pipe." },
+        ],
+      }),
+    });
+    expect(indexRes.status).toBe(200);
+
+    // Chunks indexed before titles moved out of chunk text carry a "<title> | " prefix
+    await env.DB
+      .prepare("UPDATE chunks SET text = ? || ' | ' || text WHERE video_id = ? AND seq = 2")
+      .bind(title, "__test__int_prefix_vid")
+      .run();
+
+    const searchRes = await SELF.fetch("http://localhost/api/search", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ query: "caching title prefixes", limit: 20 }),
+    });
+    expect(searchRes.status).toBe(200);
+    const searchBody = (await searchRes.json()) as {
+      results: Array<{ video_id: string; text: string }>;
+    };
+    const texts = searchBody.results
+      .filter((result) => result.video_id === "__test__int_prefix_vid")
+      .map((result) => result.text)
+      .sort();
+    expect(texts).toEqual([
+      "Costs | benefits of caching are easy to measure.",
+      "Legacy excerpt | with a pipe.",
+      "New chunks are stored without a title.",
+    ]);
+  });
+
   it("R2 transcript roundtrip", async () => {
     // Set up video in D1 for this isolated test
     await env.DB
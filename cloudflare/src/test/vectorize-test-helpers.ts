@@ -114,6 +114,9 @@ export function createVectorizeModuleMock() {
     generateEmbedding: async (_ai: AiLike, text: string) => {
       return makeDeterministicEmbedding(text);
     },
+    generateQueryEmbedding: async (_ai: AiLike, query: string) => {
+      return makeDeterministicEmbedding(query.trim());
+    },
     generateEmbeddings: async (_ai: AiLike, texts: string[]) => {
       return texts.map((text) => makeDeterministicEmbedding(text));
     },
@@ -1,11 +1,14 @@
 import { describe, it, expect } from "vitest";
 import {
+  EMBEDDING_BATCH_SIZE,
   generateEmbedding,
   generateEmbeddings,
+  generateQueryEmbedding,
   upsertVector,
   searchVectors,
   deleteVectors,
 } from "../vectorize";
+import type { AiLike } from "../vectorize";
 import {
   createFakeAi,
   createMemoryVectorizeIndex,
@@ -29,6 +32,58 @@ describe("Workers AI Embeddings", () => {
     expect(embeddings[0].length).toBe(768);
     expect(embeddings[1].length).toBe(768);
   });
+
+  it("generateEmbeddings splits large inputs into fixed-size batches", async () => {
+    const batchSizes: number[] = [];
+    const countingAi = {
+      run: async (_model: string, inputs: { text: string[] }) => {
+        batchSizes.push(inputs.text.length);
+        return { data: inputs.text.map((text) => makeDeterministicEmbedding(text)) };
+      },
+    } as AiLike;
+
+    const texts = Array.from({ length: EMBEDDING_BATCH_SIZE * 2 + 5 }, (_, i) => `Text ${i}`);
+    const embeddings = await generateEmbeddings(countingAi, texts);
+
+    expect(batchSizes).toEqual([EMBEDDING_BATCH_SIZE, EMBEDDING_BATCH_SIZE, 5]);
+    expect(embeddings.length).toBe(texts.length);
+    expect(embeddings[texts.length - 1]).toEqual(
+      makeDeterministicEmbedding(texts[texts.length - 1])
+    );
+  });
+
+  it("generateQueryEmbedding reuses the embedding for a repeated query", async () => {
+    let calls = 0;
+    const countingAi = {
+      run: async (_model: string, inputs: { text: string[] }) => {
+        calls++;
+        return { data: inputs.text.map((text) => makeDeterministicEmbedding(text)) };
+      },
+    } as AiLike;
+
+    const first = await generateQueryEmbedding(countingAi, "cached query test");
+    const second = await generateQueryEmbedding(countingAi, "  cached query test ");
+
+    expect(calls).toBe(1);
+    expect(second).toEqual(first);
+  });
+
+  it("generateEmbeddings keeps input order when batches finish out of order", async () => {
+    let pending = 0;
+    const slowFirstAi = {
+      run: async (_model: string, inputs: { text: string[] }) => {
+        // Earlier batches resolve later
+        const delay = 10 * (3 - pending++);
+        await new Promise((resolve) => setTimeout(resolve, delay));
+        return { data: inputs.text.map((text) => makeDeterministicEmbedding(text)) };
+      },
+    } as AiLike;
+
+    const texts = Array.from({ length: EMBEDDING_BATCH_SIZE * 2 + 5 }, (_, i) => `Text ${i}`);
+    const embeddings = await generateEmbeddings(slowFirstAi, texts);
+
+    expect(embeddings).toEqual(texts.map((text) => makeDeterministicEmbedding(text)));
+  });
 });
 
 describe("Vectorize Operations", () => {
@@ -8,9 +8,20 @@ interface EmbeddingResponse {
   pooling?: "mean" | "cls";
 }
 
+// Workers AI accepts at most 100 texts per bge-base embedding request
+export const EMBEDDING_BATCH_SIZE = 100;
+
 export type AiLike = Pick<Ai, "run">;
 export type VectorizeIndexLike = Pick<VectorizeIndex, "upsert" | "query" | "deleteByIds">;
 
+/**
+ * Text embedded for a transcript chunk
+ * The video title gives each chunk context, but is stored only once on the video row
+ */
+export function chunkEmbeddingText(videoTitle: string, text: string): string {
+  return `${videoTitle} | ${text}`;
+}
+
 /**
  * Generate an embedding for a single text using Workers AI
  * Model: @cf/baai/bge-base-en-v1.5 (768 dimensions)
@@ -27,20 +38,61 @@ export async function generateEmbedding(ai: AiLike, text: string): Promise<numbe
   return response.data[0];
 }
 
+// Query embeddings cached per isolate, so a repeated search skips Workers AI
+export const QUERY_EMBEDDING_CACHE_SIZE = 256;
+const queryEmbeddingCache = new Map<string, Promise<number[]>>();
+
+/**
+ * Generate an embedding for a search query, reusing the result for repeated queries
+ * Least recently used queries are evicted beyond QUERY_EMBEDDING_CACHE_SIZE
+ */
+export function generateQueryEmbedding(ai: AiLike, query: string): Promise<number[]> {
+  const key = query.trim();
+  let embedding = queryEmbeddingCache.get(key);
+
+  if (embedding) {
+    // Re-insert to mark as most recently used
+    queryEmbeddingCache.delete(key);
+  } else {
+    const pending = generateEmbedding(ai, key);
+    // Don't keep failures around, so the next search retries; the entry may
+    // already have been evicted and replaced by a newer request for the key
+    pending.catch(() => {
+      if (queryEmbeddingCache.get(key) === pending) queryEmbeddingCache.delete(key);
+    });
+    embedding = pending;
+    if (queryEmbeddingCache.size >= QUERY_EMBEDDING_CACHE_SIZE) {
+      queryEmbeddingCache.delete(queryEmbeddingCache.keys().next().value!);
+    }
+  }
+
+  queryEmbeddingCache.set(key, embedding);
+  return embedding;
+}
+
 /**
  * Generate embeddings for multiple texts using Workers AI
- * Workers AI supports batching for efficiency
+ * Texts are sent in fixed-size batches of EMBEDDING_BATCH_SIZE, all in flight at once
  */
 export async function generateEmbeddings(ai: AiLike, texts: string[]): Promise<number[][]> {
-  const response = (await ai.run("@cf/baai/bge-base-en-v1.5", {
-    text: texts,
-  })) as EmbeddingResponse;
+  const embedBatch = async (batch: string[]): Promise<number[][]> => {
+    const response = (await ai.run("@cf/baai/bge-base-en-v1.5", {
+      text: batch,
+    })) as EmbeddingResponse;
 
-  if (!response.data) {
-    throw new Error("No embedding data returned");
+    if (!response.data) {
+      throw new Error("No embedding data returned");
+    }
+
+    return response.data;
+  };
+
+  const batches: Promise<number[][]>[] = [];
+  for (let i = 0; i < texts.length; i += EMBEDDING_BATCH_SIZE) {
+    batches.push(embedBatch(texts.slice(i, i + EMBEDDING_BATCH_SIZE)));
   }
 
-  return response.data;
+  return (await Promise.all(batches)).flat();
 }
 
 /**
@@ -0,0 +1,58 @@
+/**
+ * Persistent download cache shared across CLI runs.
+ */
+
+import { homedir } from 'os';
+import { join } from 'path';
+import { readdir, stat, unlink } from 'fs/promises';
+
+// Total size the cache may grow to before the oldest files are trimmed
+const DEFAULT_CACHE_MAX_BYTES = 5 * 1024 ** 3;
+
+/**
+ * Get the cache directory, or a subdirectory of it.
+ * Uses CHANNEL_CHAT_CACHE_DIR, or ~/.cache/channel-chat.
+ */
+export function getCacheDir(...subdirs: string[]): string {
+  const root = process.env.CHANNEL_CHAT_CACHE_DIR || join(homedir(), '.cache', 'channel-chat');
+  return join(root, ...subdirs);
+}
+
+/**
+ * Delete the least recently used cached files until the cache fits in maxBytes.
+ * Cache hits refresh a file's mtime, so mtime order is recency order.
+ */
+export async function trimCache(maxBytes: number = DEFAULT_CACHE_MAX_BYTES): Promise<void> {
+  const files: Array<{ path: string; size: number; mtimeMs: number }> = [];
+
+  for (const subdir of ['subtitles', 'segments', 'audio']) {
+    const dir = getCacheDir(subdir);
+    let names: string[];
+    try {
+      names = await readdir(dir);
+    } catch {
+      continue;
+    }
+    for (const name of names) {
+      const path = join(dir, name);
+      try {
+        const info = await stat(path);
+        if (info.isFile()) {
+          files.push({ path, size: info.size, mtimeMs: info.mtimeMs });
+        }
+      } catch {}
+    }
+  }
+
+  let total = files.reduce((sum, file) => sum + file.size, 0);
+  if (total <= maxBytes) return;
+
+  files.sort((a, b) => a.mtimeMs - b.mtimeMs);
+  for (const file of files) {
+    if (total <= maxBytes) break;
+    try {
+      await unlink(file.path);
+      total -= file.size;
+    } catch {}
+  }
+}
@@ -2,7 +2,9 @@
  * Token-based transcript chunking with overlap.
  */
 
-import { encode } from 'gpt-tokenizer';
+import { createRequire } from 'module';
+
+const require = createRequire(import.meta.url);
 
 // Types
 export interface Segment {
@@ -18,11 +20,78 @@ export interface Chunk {
   seq: number;
 }
 
+// Lazily loaded tokenizer. gpt-tokenizer parses its bundled BPE ranks on
+// import, so defer that cost until the first transcript is chunked.
+let _encode: typeof import('gpt-tokenizer').encode | null = null;
+
+function getEncoder(): typeof import('gpt-tokenizer').encode {
+  if (!_encode) {
+    _encode = (require('gpt-tokenizer') as typeof import('gpt-tokenizer')).encode;
+  }
+  return _encode;
+}
+
+/**
+ * Load the tokenizer ahead of time, e.g. while waiting on network I/O,
+ * so the first chunkTranscript call doesn't pay the load cost.
+ */
+export function warmTokenizer(): void {
+  getEncoder();
+}
+
+// Encode special-token strings as ordinary text (like tiktoken's encode_ordinary).
+// Skips the per-call disallowed-special-token scan, and transcripts that happen
+// to contain e.g. "<|endoftext|>" no longer throw.
+const ORDINARY_ENCODE_OPTIONS = { disallowedSpecial: new Set<string>() };
+
+// Token counts of short texts, which repeat often in transcripts ("[Music]",
+// speaker tags, filler). Long texts are almost always unique and not cached.
+const TOKEN_COUNT_CACHE_MAX_ENTRIES = 8192;
+const TOKEN_COUNT_CACHE_MAX_LENGTH = 128;
+const _tokenCountCache = new Map<string, number>();
+
 /**
  * Count the number of tokens in a text string using GPT tokenizer.
  */
 export function countTokens(text: string): number {
-  return encode(text).length;
+  if (text.length >= TOKEN_COUNT_CACHE_MAX_LENGTH) {
+    return getEncoder()(text, ORDINARY_ENCODE_OPTIONS).length;
+  }
+
+  const cached = _tokenCountCache.get(text);
+  if (cached !== undefined) return cached;
+
+  const count = getEncoder()(text, ORDINARY_ENCODE_OPTIONS).length;
+  if (_tokenCountCache.size >= TOKEN_COUNT_CACHE_MAX_ENTRIES) {
+    // Evict the oldest entry (Map iterates in insertion order)
+    _tokenCountCache.delete(_tokenCountCache.keys().next().value!);
+  }
+  _tokenCountCache.set(text, count);
+  return count;
+}
+
+/**
+ * Index of the first element in a sorted array that is >= value.
+ */
+function bisectLeft(arr: number[], value: number, lo: number = 0, hi: number = arr.length): number {
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (arr[mid] < value) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/**
+ * Index of the first element in a sorted array that is > value.
+ */
+function bisectRight(arr: number[], value: number, lo: number = 0, hi: number = arr.length): number {
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (arr[mid] <= value) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
 }
 
 /**
@@ -30,7 +99,6 @@ export function countTokens(text: string): number {
  */
 export function chunkTranscript(
   segments: Segment[],
-  videoTitle: string,
   targetTokens: number = 800,
   overlapPct: number = 0.15
 ): Chunk[] {
@@ -42,88 +110,61 @@ export function chunkTranscript(
   // Calculate overlap tokens
   const overlapTokens = Math.floor(targetTokens * overlapPct);
 
-  // Current chunk state
-  let currentSegments: Segment[] = [];
-  let currentTokenCount = 0;
+  // Prefix sums of segment token counts: prefix[j] - prefix[i] is the
+  // token count of segments[i..j), so chunk boundaries are binary searches.
+  const n = segments.length;
+  const texts = segments.map(s => s.text);
+  const startTimes = segments.map(s => s.start_time);
+  const endTimes = segments.map(s => s.end_time);
+  const prefix: number[] = new Array(n + 1);
+  prefix[0] = 0;
+  for (let k = 0; k < n; k++) {
+    prefix[k + 1] = prefix[k] + countTokens(texts[k]);
+  }
 
-  // Segments to carry over for overlap
-  let overlapSegments: Segment[] = [];
-  let overlapTokenCount = 0;
+  const emit = (from: number, to: number) => {
+    chunks.push({
+      text: texts.slice(from, to).join(' '),
+      start_time: startTimes[from],
+      end_time: endTimes[to - 1],
+      seq,
+    });
+    seq++;
+  };
 
+  // The current chunk is always the contiguous range segments[start..i)
+  let start = 0;
   let i = 0;
-  while (i < segments.length) {
-    const segment = segments[i];
-    const segmentText = segment.text;
-    const segmentTokens = countTokens(segmentText);
-
-    // Handle very long segments (longer than target)
-    if (segmentTokens > targetTokens && currentSegments.length === 0) {
+  while (i < n) {
+    if (start === i) {
       // This segment alone exceeds target - emit it as its own chunk
-      const chunkText = `${videoTitle} | ${segmentText}`;
-      chunks.push({
-        text: chunkText,
-        start_time: segment.start_time,
-        end_time: segment.end_time,
-        seq,
-      });
-      seq++;
+      if (prefix[i + 1] - prefix[i] > targetTokens) {
+        emit(i, i + 1);
+        start = i = i + 1;
+        continue;
+      }
       i++;
-      continue;
     }
 
-    // Check if adding this segment exceeds target
-    if (currentTokenCount + segmentTokens > targetTokens && currentSegments.length > 0) {
-      // Emit current chunk
-      const combinedText = currentSegments.map(s => s.text).join(' ');
-      const chunkText = `${videoTitle} | ${combinedText}`;
-      chunks.push({
-        text: chunkText,
-        start_time: currentSegments[0].start_time,
-        end_time: currentSegments[currentSegments.length - 1].end_time,
-        seq,
-      });
-      seq++;
-
-      // Calculate overlap: keep segments from the end that total ~overlapTokens
-      overlapSegments = [];
-      overlapTokenCount = 0;
-      for (let j = currentSegments.length - 1; j >= 0; j--) {
-        const seg = currentSegments[j];
-        const segTokens = countTokens(seg.text);
-        if (overlapTokenCount + segTokens <= overlapTokens) {
-          overlapSegments.unshift(seg);
-          overlapTokenCount += segTokens;
-        } else {
-          // Include this segment if we have no overlap yet
-          if (overlapSegments.length === 0) {
-            overlapSegments.unshift(seg);
-            overlapTokenCount += segTokens;
-          }
-          break;
-        }
-      }
+    // Extend to the last segment boundary that keeps the chunk within target
+    const end = Math.max(i, bisectRight(prefix, prefix[start] + targetTokens) - 1);
+    if (end >= n) break;
 
-      // Start new chunk with overlap
-      currentSegments = [...overlapSegments];
-      currentTokenCount = overlapTokenCount;
-    }
+    // segments[end] doesn't fit - emit the current chunk
+    emit(start, end);
 
-    // Add segment to current chunk
-    currentSegments.push(segment);
-    currentTokenCount += segmentTokens;
-    i++;
+    // Overlap: trailing segments totalling at most overlapTokens, but at least one
+    let overlapStart = bisectLeft(prefix, prefix[end] - overlapTokens, start, end);
+    if (overlapStart === end) overlapStart = end - 1;
+
+    // Start new chunk with overlap plus the segment that didn't fit
+    start = overlapStart;
+    i = end + 1;
   }
 
   // Emit final chunk if we have remaining segments
-  if (currentSegments.length > 0) {
-    const combinedText = currentSegments.map(s => s.text).join(' ');
-    const chunkText = `${videoTitle} | ${combinedText}`;
-    chunks.push({
-      text: chunkText,
-      start_time: currentSegments[0].start_time,
-      end_time: currentSegments[currentSegments.length - 1].end_time,
-      seq,
-    });
+  if (start < n) {
+    emit(start, n);
   }
 
   return chunks;
@@ -14,7 +14,7 @@ import { Command } from 'commander';
 import chalk from 'chalk';
 import ora from 'ora';
 import { mkdtempSync, rmSync } from 'fs';
-import { readFile } from 'fs/promises';
+import { mkdtemp, readFile, rm } from 'fs/promises';
 import { join } from 'path';
 import { tmpdir } from 'os';
 
@@ -22,12 +22,13 @@ import {
   getChannelInfo,
   getChannelVideos,
   getVideoInfo,
-  downloadSubtitles,
+  fetchSubtitles,
   downloadAudio,
   DownloaderError,
 } from './downloader.js';
-import { parseSubtitles, transcribeAudio } from './transcriber.js';
-import { chunkTranscript, Segment } from './chunker.js';
+import { parseSubtitleContentCached, transcribeAudio } from './transcriber.js';
+import { chunkTranscript, warmTokenizer, Segment } from './chunker.js';
+import { getCacheDir, trimCache } from './cache.js';
 import {
   getCloudflareConfig,
   uploadToR2,
@@ -40,6 +41,9 @@ import {
 
 const program = new Command();
 
+// Videos indexed in parallel by `add` unless --concurrency is given
+const DEFAULT_CONCURRENCY = 4;
+
 /**
  * Index a single video to Cloudflare. Returns true on success, false on failure.
  */
@@ -50,20 +54,27 @@ async function indexVideoCloudflare(
   tempDir: string,
   spinner?: ReturnType<typeof ora>
 ): Promise<boolean> {
-  try {
-    if (spinner) spinner.text = `Getting metadata for ${videoId}...`;
-    const videoInfo = await getVideoInfo(videoId);
+  // A disabled spinner (non-TTY, or concurrent workers) never renders text,
+  // so skip the per-step updates and download progress parsing entirely
+  const liveSpinner = spinner?.isSpinning ? spinner : undefined;
+  const onProgress = liveSpinner
+    ? (msg: string) => { liveSpinner.text = `${videoId}: ${msg}`; }
+    : undefined;
 
-    // Download subtitles/transcript
-    if (spinner) spinner.text = `Downloading subtitles for ${videoId}...`;
-    const subtitlePath = await downloadSubtitles(videoId, tempDir);
+  try {
+    // Metadata and subtitles come from separate requests, so fetch them together
+    if (liveSpinner) liveSpinner.text = `Getting metadata and subtitles for ${videoId}...`;
+    const [videoInfo, subtitles] = await Promise.all([
+      getVideoInfo(videoId),
+      fetchSubtitles(videoId),
+    ]);
 
     let segments: Segment[] | null = null;
     let transcriptSource: string | null = null;
 
-    if (subtitlePath) {
-      if (spinner) spinner.text = `Parsing subtitles for ${videoId}...`;
-      segments = await parseSubtitles(subtitlePath);
+    if (subtitles) {
+      if (liveSpinner) liveSpinner.text = `Parsing subtitles for ${videoId}...`;
+      segments = await parseSubtitleContentCached(subtitles.content, subtitles.ext);
       transcriptSource = 'subtitles';
     } else {
       // No subtitles - try ElevenLabs if API key is set
@@ -72,12 +83,10 @@ async function indexVideoCloudflare(
         return false;
       }
 
-      if (spinner) spinner.text = `Downloading audio for ${videoId}...`;
-      const audioPath = await downloadAudio(videoId, tempDir, (msg) => {
-        if (spinner) spinner.text = `${videoId}: ${msg}`;
-      });
+      if (liveSpinner) liveSpinner.text = `Downloading audio for ${videoId}...`;
+      const audioPath = await downloadAudio(videoId, getCacheDir('audio'), onProgress);
 
-      if (spinner) spinner.text = `Transcribing ${videoId}...`;
+      if (liveSpinner) liveSpinner.text = `Transcribing ${videoId}...`;
       segments = await transcribeAudio(audioPath);
       transcriptSource = 'transcription';
     }
@@ -87,34 +96,40 @@ async function indexVideoCloudflare(
       return false;
     }
 
-    if (spinner) spinner.text = `Chunking transcript for ${videoId}...`;
-    const chunks = chunkTranscript(segments, videoInfo.title);
+    if (liveSpinner) liveSpinner.text = `Chunking transcript for ${videoId}...`;
+    const chunks = chunkTranscript(segments);
 
     if (chunks.length === 0) {
       console.log(chalk.yellow(`Warning: No chunks generated for ${videoId}`));
       return false;
     }
 
-    // Download video for R2 upload
-    if (spinner) spinner.text = `Downloading video ${videoId}...`;
-    const videoPath = await downloadVideo(videoId, tempDir, 720, (msg) => {
-      if (spinner) spinner.text = `${videoId}: ${msg}`;
-    });
-
-    // Upload video to R2
-    if (spinner) spinner.text = `Uploading video to R2...`;
+    // The transcript upload doesn't depend on the video, so it runs while the
+    // video downloads and uploads; indexing waits until both are in R2.
+    // Both branches settle before any failure is rethrown, so yt-dlp is never
+    // still writing into tempDir when the caller removes it.
     const r2VideoKey = `videos/${videoId}.mp4`;
-    const videoData = await readFile(videoPath);
-    await uploadToR2(config, r2VideoKey, videoData, 'video/mp4');
-
-    // Upload transcript to R2
-    if (spinner) spinner.text = `Uploading transcript to R2...`;
     const r2TranscriptKey = `transcripts/${videoId}.json`;
     const transcriptData = Buffer.from(JSON.stringify(segments));
-    await uploadToR2(config, r2TranscriptKey, transcriptData, 'application/json');
+
+    if (liveSpinner) liveSpinner.text = `Downloading video ${videoId}...`;
+    const uploads = await Promise.allSettled([
+      (async () => {
+        const videoPath = await downloadVideo(videoId, tempDir, 720, onProgress);
+
+        // Upload video to R2
+        if (liveSpinner) liveSpinner.text = `Uploading video to R2...`;
+        const videoData = await readFile(videoPath);
+        await uploadToR2(config, r2VideoKey, videoData, 'video/mp4');
+      })(),
+      uploadToR2(config, r2TranscriptKey, transcriptData, 'application/json'),
+    ]);
+    for (const upload of uploads) {
+      if (upload.status === 'rejected') throw upload.reason;
+    }
 
     // Call indexContent API (worker handles embedding generation)
-    if (spinner) spinner.text = `Indexing ${videoId} via Cloudflare Worker...`;
+    if (liveSpinner) liveSpinner.text = `Indexing ${videoId} via Cloudflare Worker...`;
     const indexRequest: IndexRequest = {
       channel: {
         id: channelInfo.channel_id,
@@ -195,10 +210,10 @@ program
   .description('Add a YouTube channel and index all its videos to Cloudflare')
   .argument('<url>', 'YouTube channel URL (e.g., https://www.youtube.com/@channelname)')
   .option('-l, --limit <number>', 'Maximum number of videos to index')
-  .option('-c, --concurrency <number>', 'Number of videos to process in parallel', '1')
+  .option('-c, --concurrency <number>', 'Number of videos to process in parallel', String(DEFAULT_CONCURRENCY))
   .action(async (url: string, options: { limit?: string; concurrency: string }) => {
     const limit = options.limit ? parseInt(options.limit, 10) : undefined;
-    const concurrency = Math.max(1, parseInt(options.concurrency, 10) || 1);
+    const concurrency = Math.max(1, parseInt(options.concurrency, 10) || DEFAULT_CONCURRENCY);
 
     let cfConfig: CloudflareConfig;
     try {
@@ -210,7 +225,10 @@ program
 
     try {
       const spinner = ora('Fetching channel information...').start();
-      const channelInfo = await getChannelInfo(url);
+      const channelInfoPromise = getChannelInfo(url);
+      // Load the tokenizer while the channel lookup waits on the network
+      setImmediate(warmTokenizer);
+      const channelInfo = await channelInfoPromise;
       spinner.succeed(`Found channel: ${channelInfo.name}`);
 
       console.log(chalk.green(`  ID: ${channelInfo.channel_id}`));
@@ -243,35 +261,43 @@ program
 
       console.log(chalk.cyan(`Indexing ${newVideoIds.length} new videos (concurrency: ${concurrency})...`));
 
-      const tempDir = mkdtempSync(join(tmpdir(), 'channel-chat-'));
+      const results = await runWithConcurrency(newVideoIds, concurrency, async (videoId, i) => {
+        const progress = `[${i + 1}/${newVideoIds.length}]`;
+        // Concurrent spinners overwrite each other's line, so only animate with a single worker
+        const videoSpinner = ora({
+          text: `${progress} Indexing video...`,
+          isEnabled: concurrency === 1 ? undefined : false,
+        }).start();
+
+        // Each video gets its own temp dir, removed as soon as it is done, so
+        // downloaded media doesn't pile up on disk for the whole channel
+        const videoTempDir = await mkdtemp(join(tmpdir(), 'channel-chat-'));
+        let success: boolean;
+        try {
+          success = await indexVideoCloudflare(videoId, channelInfo, cfConfig, videoTempDir, videoSpinner);
+        } finally {
+          await rm(videoTempDir, { recursive: true, force: true });
+        }
 
-      try {
-        const results = await runWithConcurrency(newVideoIds, concurrency, async (videoId, i) => {
-          const progress = `[${i + 1}/${newVideoIds.length}]`;
-          const videoSpinner = ora(`${progress} Indexing video...`).start();
-
-          const success = await indexVideoCloudflare(videoId, channelInfo, cfConfig, tempDir, videoSpinner);
-
-          if (success) {
-            videoSpinner.succeed(`${progress} Indexed successfully`);
-            return true;
-          } else {
-            videoSpinner.fail(`${progress} Failed`);
-            return false;
-          }
-        });
-
-        const indexed = results.filter(Boolean).length;
-        const failed = results.length - indexed;
-
-        console.log('');
-        console.log(chalk.bold('Indexing Complete'));
-        console.log(chalk.green(`  Successfully indexed: ${indexed}`));
-        console.log(chalk.red(`  Failed: ${failed}`));
-        console.log(chalk.yellow(`  Skipped (already indexed): ${skipped}`));
-      } finally {
-        rmSync(tempDir, { recursive: true, force: true });
-      }
+        if (success) {
+          videoSpinner.succeed(`${progress} Indexed successfully`);
+          return true;
+        } else {
+          videoSpinner.fail(`${progress} Failed`);
+          return false;
+        }
+      });
+
+      const indexed = results.filter(Boolean).length;
+      const failed = results.length - indexed;
+
+      console.log('');
+      console.log(chalk.bold('Indexing Complete'));
+      console.log(chalk.green(`  Successfully indexed: ${indexed}`));
+      console.log(chalk.red(`  Failed: ${failed}`));
+      console.log(chalk.yellow(`  Skipped (already indexed): ${skipped}`));
+
+      await trimCache();
     } catch (error) {
       if (error instanceof DownloaderError) {
         console.log(chalk.red(`Error: ${error.message}`));
@@ -296,7 +322,10 @@ program
 
     try {
       const spinner = ora('Getting video information...').start();
-      const videoInfo = await getVideoInfo(videoId);
+      const videoInfoPromise = getVideoInfo(videoId);
+      // Load the tokenizer while the metadata lookup waits on the network
+      setImmediate(warmTokenizer);
+      const videoInfo = await videoInfoPromise;
       const channelId = videoInfo.channel_id;
       spinner.succeed('Got video information');
 
@@ -327,6 +356,8 @@ program
       } finally {
         rmSync(tempDir, { recursive: true, force: true });
       }
+
+      await trimCache();
     } catch (error) {
       if (error instanceof DownloaderError) {
         console.log(chalk.red(`Error: ${error.message}`));
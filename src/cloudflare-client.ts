@@ -130,6 +130,19 @@ function createR2Client(config: CloudflareConfig): S3Client {
   });
 }
 
+// R2 clients by config, so successive uploads share one client and its
+// keep-alive connections instead of a fresh TLS handshake per upload
+const _r2Clients = new WeakMap<CloudflareConfig, S3Client>();
+
+function getR2Client(config: CloudflareConfig): S3Client {
+  let client = _r2Clients.get(config);
+  if (!client) {
+    client = createR2Client(config);
+    _r2Clients.set(config, client);
+  }
+  return client;
+}
+
 /**
  * Upload a file to Cloudflare R2.
  * @param config - Cloudflare configuration
@@ -144,7 +157,7 @@ export async function uploadToR2(
   data: Buffer | ReadableStream,
   contentType: string
 ): Promise<string> {
-  const client = createR2Client(config);
+  const client = getR2Client(config);
 
   try {
     const command = new PutObjectCommand({
@@ -159,11 +172,35 @@ export async function uploadToR2(
   } catch (error) {
     const errorMessage = error instanceof Error ? error.message : String(error);
     throw new Error(`Failed to upload to R2 (key: ${key}): ${errorMessage}`);
-  } finally {
-    client.destroy();
   }
 }
 
+// Retries for /api/index responses that signal throttling. Only 429 is
+// retried: the index request is not idempotent, and a 503 may arrive after
+// the chunks were already written, so retrying it would duplicate them.
+const INDEX_MAX_RETRIES = 3;
+const INDEX_RETRY_BASE_DELAY_MS = 1000;
+const INDEX_MAX_RETRY_DELAY_MS = 60 * 1000;
+
+/**
+ * How long to wait before retrying a throttled response. Honors a
+ * Retry-After header (seconds or HTTP date), else backs off exponentially.
+ */
+function getRetryDelayMs(response: Response, attempt: number): number {
+  const retryAfter = response.headers.get('Retry-After');
+  if (retryAfter) {
+    const seconds = Number(retryAfter);
+    if (Number.isFinite(seconds)) {
+      return Math.max(0, seconds * 1000);
+    }
+    const date = Date.parse(retryAfter);
+    if (!Number.isNaN(date)) {
+      return Math.max(0, date - Date.now());
+    }
+  }
+  return INDEX_RETRY_BASE_DELAY_MS * 2 ** attempt;
+}
+
 /**
  * Index content via the Cloudflare Worker.
  * @param config - Cloudflare configuration
@@ -186,11 +223,19 @@ export async function indexContent(
   }
 
   try {
-    const response = await fetch(url, {
-      method: 'POST',
-      headers,
-      body: JSON.stringify(request),
-    });
+    const body = JSON.stringify(request);
+    let response = await fetch(url, { method: 'POST', headers, body });
+
+    // Retry only when the Worker or its upstreams signal throttling
+    for (let attempt = 0; attempt < INDEX_MAX_RETRIES && response.status === 429; attempt++) {
+      // Fail rather than stall the caller on a very long Retry-After
+      const delayMs = getRetryDelayMs(response, attempt);
+      if (delayMs > INDEX_MAX_RETRY_DELAY_MS) break;
+
+      await response.body?.cancel();
+      await new Promise((resolve) => setTimeout(resolve, delayMs));
+      response = await fetch(url, { method: 'POST', headers, body });
+    }
 
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({ error: response.statusText }));
@@ -3,9 +3,10 @@
  */
 
 import { Innertube } from 'youtubei.js';
-import { writeFile, mkdir } from 'fs/promises';
+import { readFile, writeFile, mkdir, rename, utimes } from 'fs/promises';
 import { join, dirname } from 'path';
 import { existsSync } from 'fs';
+import { getCacheDir } from './cache.js';
 
 // Custom error types
 export class DownloaderError extends Error {
@@ -204,10 +205,25 @@ export async function getChannelVideos(channelUrlOrId: string): Promise<string[]
   }
 }
 
+// In-flight and completed metadata lookups, so callers that ask for the same
+// video (e.g. index-video and indexVideoCloudflare) share one request
+const _videoInfoCache = new Map<string, Promise<VideoInfo>>();
+
 /**
  * Get metadata for a specific video.
  */
-export async function getVideoInfo(videoId: string): Promise<VideoInfo> {
+export function getVideoInfo(videoId: string): Promise<VideoInfo> {
+  let info = _videoInfoCache.get(videoId);
+  if (!info) {
+    info = fetchVideoInfo(videoId);
+    _videoInfoCache.set(videoId, info);
+    // Don't cache failures, so a later call can retry
+    info.catch(() => _videoInfoCache.delete(videoId));
+  }
+  return info;
+}
+
+async function fetchVideoInfo(videoId: string): Promise<VideoInfo> {
   try {
     const yt = await getInnertube();
     const info = await yt.getBasicInfo(videoId);
@@ -241,62 +257,86 @@ export async function getVideoInfo(videoId: string): Promise<VideoInfo> {
   }
 }
 
-/**
- * Download subtitles for a video using yt-dlp via Python.
- * Returns path to the downloaded subtitle file, or null if no subtitles available.
- */
-export async function downloadSubtitles(videoId: string, outputDir: string): Promise<string | null> {
-  const { spawn } = await import('child_process');
-  const { readdir } = await import('fs/promises');
+// Subtitle languages in order of preference, shared with the Python script
+const MANUAL_SUBTITLE_LANGS = ['en', 'en-US', 'en-GB'];
+const AUTO_SUBTITLE_LANGS = ['en', 'en-orig', 'en-US', 'en-GB'];
 
-  await mkdir(outputDir, { recursive: true });
+// Subtitle formats the transcriber can parse; any other track (srv3, json3,
+// ttml, ...) counts as no subtitles so transcription can take over
+const SUBTITLE_EXTS = new Set(['vtt', 'srt']);
 
-  const pythonScript = `
-import yt_dlp
+// Picks manual English subtitles, falling back to auto captions, fetches the
+// chosen track and prints it to stdout as JSON ({"ext": ..., "content": ...}).
+const SUBTITLE_SCRIPT = `
+import json
+import os
 import sys
 
+import yt_dlp
+
 video_id = sys.argv[1]
-output_dir = sys.argv[2]
+
+manual_langs = ${JSON.stringify(MANUAL_SUBTITLE_LANGS)}
+auto_langs = ${JSON.stringify(AUTO_SUBTITLE_LANGS)}
 
 opts = {
     'quiet': True,
     'no_warnings': True,
     'writesubtitles': True,
     'writeautomaticsub': False,
-    'subtitleslangs': ['en', 'en-US', 'en-GB'],
-    'subtitlesformat': 'vtt/srt/best',
+    'subtitleslangs': manual_langs,
+    'subtitlesformat': 'vtt/srt',
     'skip_download': True,
-    'outtmpl': f'{output_dir}/{video_id}.%(ext)s',
+    'socket_timeout': 10,
+    # Only subtitles are needed, so skip fetching the stream manifests
+    'youtube_include_dash_manifest': False,
+    'youtube_include_hls_manifest': False,
 }
 
+# Optional comma-separated YouTube player clients (e.g. "android,ios")
+player_clients = os.environ.get('CHANNEL_CHAT_YT_PLAYER_CLIENT')
+if player_clients:
+    opts['extractor_args'] = {'youtube': {'player_client': player_clients.split(',')}}
+
 video_url = f'https://www.youtube.com/watch?v={video_id}'
 
 try:
     with yt_dlp.YoutubeDL(opts) as ydl:
-        info = ydl.extract_info(video_url, download=False)
-        subtitles = info.get('subtitles', {})
-        has_manual = any(lang in subtitles for lang in ['en', 'en-US', 'en-GB'])
-
-        if has_manual:
-            ydl.download([video_url])
-        else:
-            opts['writesubtitles'] = False
-            opts['writeautomaticsub'] = True
-            opts['subtitleslangs'] = ['en', 'en-orig', 'en-US', 'en-GB']
-            with yt_dlp.YoutubeDL(opts) as ydl_auto:
-                auto_info = ydl_auto.extract_info(video_url, download=False)
-                auto_subs = auto_info.get('automatic_captions', {})
-                if any(lang in auto_subs for lang in ['en', 'en-orig', 'en-US', 'en-GB']):
-                    ydl_auto.download([video_url])
+        # Fetch the watch page once; both subtitle kinds come from this result
+        info = ydl.extract_info(video_url, download=False, process=False)
+        subtitles = info.get('subtitles') or {}
+        auto_subs = info.get('automatic_captions') or {}
+
+        langs = None
+        if subtitles.keys() & set(manual_langs):
+            langs = manual_langs
+        elif auto_subs.keys() & set(auto_langs):
+            langs = auto_langs
+            ydl.params['writesubtitles'] = False
+            ydl.params['writeautomaticsub'] = True
+            ydl.params['subtitleslangs'] = auto_langs
+
+        if langs:
+            requested = ydl.process_ie_result(info, download=False).get('requested_subtitles') or {}
+            for lang in langs:
+                sub = requested.get(lang)
+                if sub:
+                    content = sub.get('data') or ydl.urlopen(sub['url']).read().decode('utf-8')
+                    sys.stdout.write(json.dumps({'ext': sub.get('ext'), 'content': content}))
+                    break
 except Exception as e:
     pass
 `;
 
-  // Find Python with yt-dlp - use PYTHON_PATH env var or try common locations
+/**
+ * Candidate Python interpreters with yt-dlp installed, in order of preference.
+ * Uses the PYTHON_PATH env var, then common virtualenv locations.
+ */
+function getPythonCandidates(): string[] {
   const pythonFromEnv = process.env.PYTHON_PATH || process.env.CHANNEL_CHAT_PYTHON;
   // import.meta.dirname is the src/ directory, so parent has the .venv
   const projectRoot = dirname(import.meta.dirname);
-  const pythonPaths = [
+  return [
     ...(pythonFromEnv ? [pythonFromEnv] : []),
     join(projectRoot, '.venv', 'bin', 'python'),
     join(dirname(dirname(process.cwd())), '.venv', 'bin', 'python'),
@@ -305,6 +345,22 @@ except Exception as e:
     'python3',
     'python',
   ];
+}
+
+// Interpreter that last started successfully, tried first on later runs so
+// each video doesn't re-probe the missing candidates ahead of it
+let _pythonPath: string | null = null;
+
+/**
+ * Run a Python script with the first interpreter that can be started.
+ * Resolves with the script's stdout, or null if no interpreter could be started.
+ */
+async function runPythonScript(script: string, args: string[]): Promise<string | null> {
+  const { spawn } = await import('child_process');
+  const candidates = getPythonCandidates();
+  const pythonPaths = _pythonPath
+    ? [_pythonPath, ...candidates.filter((path) => path !== _pythonPath)]
+    : candidates;
 
   return new Promise((resolve) => {
     const tryPython = (index: number) => {
@@ -313,32 +369,80 @@ except Exception as e:
         return;
       }
 
-      const pythonPath = pythonPaths[index];
-      const python = spawn(pythonPath, ['-c', pythonScript, videoId, outputDir], {
-        stdio: ['ignore', 'pipe', 'pipe'],
+      const python = spawn(pythonPaths[index], ['-c', script, ...args], {
+        stdio: ['ignore', 'pipe', 'ignore'],
       });
 
-      python.on('close', async () => {
-        // Find the subtitle file
-        try {
-          const files = await readdir(outputDir);
-          for (const file of files) {
-            if (file.startsWith(videoId) && (file.endsWith('.vtt') || file.endsWith('.srt'))) {
-              resolve(join(outputDir, file));
-              return;
-            }
-          }
-        } catch {}
-        resolve(null);
+      let started = false;
+      let stdout = '';
+      python.stdout.setEncoding('utf-8');
+      python.stdout.on('data', (data: string) => {
+        stdout += data;
       });
 
-      python.on('error', () => tryPython(index + 1));
+      python.on('spawn', () => {
+        started = true;
+        _pythonPath = pythonPaths[index];
+      });
+      python.on('close', () => {
+        if (started) resolve(stdout);
+      });
+      python.on('error', () => {
+        if (!started) tryPython(index + 1);
+      });
     };
 
     tryPython(0);
   });
 }
 
+/**
+ * Subtitle track fetched into memory.
+ */
+export interface SubtitleContent {
+  /** Subtitle format extension reported by yt-dlp (e.g. "vtt", "srt") */
+  ext: string;
+  content: string;
+}
+
+/**
+ * Fetch subtitles for a video using yt-dlp via Python, without writing a file.
+ * Found subtitles are kept in the persistent cache, so re-indexing a video
+ * skips yt-dlp entirely.
+ * Returns the subtitle track's content, or null if no subtitles available.
+ */
+export async function fetchSubtitles(videoId: string): Promise<SubtitleContent | null> {
+  const cachePath = join(getCacheDir('subtitles'), `${videoId}.json`);
+  try {
+    const cached = JSON.parse(await readFile(cachePath, 'utf-8')) as SubtitleContent;
+    if (SUBTITLE_EXTS.has(cached.ext)) {
+      const now = new Date();
+      await utimes(cachePath, now, now);
+      return cached;
+    }
+  } catch {}
+
+  const stdout = await runPythonScript(SUBTITLE_SCRIPT, [videoId]);
+  if (!stdout) {
+    return null;
+  }
+
+  let subtitles: SubtitleContent;
+  try {
+    const result = JSON.parse(stdout) as { ext?: string; content?: string };
+    if (!result.content || !result.ext || !SUBTITLE_EXTS.has(result.ext)) return null;
+    subtitles = { ext: result.ext, content: result.content };
+  } catch {
+    return null;
+  }
+
+  try {
+    await mkdir(dirname(cachePath), { recursive: true });
+    await writeFile(cachePath, JSON.stringify(subtitles));
+  } catch {}
+  return subtitles;
+}
+
 /**
  * Download audio from a video for transcription.
  * Uses yt-dlp as a fallback since youtubei.js audio download is complex.
@@ -356,6 +460,17 @@ export async function downloadAudio(
   await mkdir(outputDir, { recursive: true });
   const outputPath = join(outputDir, `${videoId}.mp3`);
 
+  // Reuse audio from an earlier run when outputDir is the persistent cache
+  if (existsSync(outputPath)) {
+    const now = new Date();
+    await utimes(outputPath, now, now);
+    return outputPath;
+  }
+
+  // Download under a temporary name so an interrupted run never leaves a
+  // partial file at outputPath
+  const partialPath = join(outputDir, `${videoId}.partial.mp3`);
+
   // Download audio only (much faster than full video + extract)
   return new Promise((resolve, reject) => {
     const ytdlp = spawn('yt-dlp', [
@@ -365,7 +480,7 @@ export async function downloadAudio(
       '--audio-quality', '128K',
       '--progress',
       '--newline',
-      '-o', outputPath,
+      '-o', partialPath,
       `https://www.youtube.com/watch?v=${videoId}`
     ]);
 
@@ -386,8 +501,11 @@ export async function downloadAudio(
     });
 
     ytdlp.on('close', (code) => {
-      if (code === 0 && existsSync(outputPath)) {
-        resolve(outputPath);
+      if (code === 0 && existsSync(partialPath)) {
+        rename(partialPath, outputPath).then(
+          () => resolve(outputPath),
+          (err) => reject(new AudioDownloadError(`Failed to save audio: ${err.message}`))
+        );
       } else {
         reject(new AudioDownloadError(`Failed to download audio: ${stderr}`));
       }
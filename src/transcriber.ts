@@ -2,7 +2,10 @@
  * Transcription and subtitle parsing for YouTube videos.
  */
 
-import { readFile } from 'fs/promises';
+import { createHash } from 'crypto';
+import { mkdir, readFile, utimes, writeFile } from 'fs/promises';
+import { dirname, join } from 'path';
+import { getCacheDir } from './cache.js';
 
 // Types
 export interface Segment {
@@ -11,6 +14,74 @@ export interface Segment {
   end_time: number;
 }
 
+// Patterns shared by the subtitle parsers, compiled once
+const VTT_TIMESTAMP_RE = /([\d:.]+)\s*-->\s*([\d:.]+)/;
+const VTT_HEADER_RE = /(?<![^\n])[^\S\n]*WEBVTT(?: [^\n]*|[^\S\n]*)(?:\n|$)/;
+const VTT_CUE_RE = /(?<![^\n])([^\n]*-->[^\n]*)((?:\n(?![^\n]*-->)[^\n]*\S[^\n]*)*)/g;
+const SRT_TIMESTAMP_RE = /([\d:,]+)\s*-->\s*([\d:,]+)/;
+const LINE_ENDING_RE = /\r\n?/g;
+const SRT_DETECT_RE = /^\d+\s*\n\d{2}:\d{2}:\d{2},\d{3}/m;
+// Format detection only looks at the start of the content
+const SUBTITLE_SNIFF_CHARS = 512;
+// Bump when parser output changes, so cached parses are not reused
+const PARSE_CACHE_VERSION = 2;
+const TAG_RE = /<[^>]+>/g;
+const CURLY_TAG_RE = /\{[^}]+\}/g;
+const WHITESPACE_RE = /\s+/g;
+
+// Adjacent cues share boundaries (one cue's end is the next one's start) and
+// intros/outros repeat across a channel's videos, so parsed timestamps and
+// cleaned texts are memoized. Each memo is cleared when it fills up.
+const MEMO_MAX_ENTRIES = 8192;
+const vttTimestampMemo = new Map<string, number>();
+const srtTimestampMemo = new Map<string, number>();
+const cleanTextMemo = new Map<string, string>();
+
+/**
+ * Return the memoized value for key, computing and storing it on a miss.
+ */
+function memoize<T>(memo: Map<string, T>, key: string, compute: (key: string) => T): T {
+  let value = memo.get(key);
+  if (value === undefined) {
+    value = compute(key);
+    if (memo.size >= MEMO_MAX_ENTRIES) memo.clear();
+    memo.set(key, value);
+  }
+  return value;
+}
+
+/**
+ * Fast path for the common fixed-width HH:MM:SS.mmm form (with separator
+ * as the decimal mark), reading digits by char code instead of splitting.
+ * Returns null for anything else so callers fall back to the general parser.
+ */
+function parseFixedWidthTimestamp(timestamp: string, separator: number): number | null {
+  if (
+    timestamp.length !== 12 ||
+    timestamp.charCodeAt(2) !== 58 ||
+    timestamp.charCodeAt(5) !== 58 ||
+    timestamp.charCodeAt(8) !== separator
+  ) {
+    return null;
+  }
+
+  let hours = 0;
+  let minutes = 0;
+  let millis = 0;
+  for (let i = 0; i < 12; i++) {
+    if (i === 2 || i === 5 || i === 8) continue;
+    const digit = timestamp.charCodeAt(i) - 48;
+    if (digit < 0 || digit > 9) return null;
+    if (i < 2) hours = hours * 10 + digit;
+    else if (i < 5) minutes = minutes * 10 + digit;
+    else millis = millis * 10 + digit;
+  }
+
+  // Dividing the exact integer count of milliseconds rounds the same way
+  // parseFloat does for the decimal seconds
+  return hours * 3600 + minutes * 60 + millis / 1000;
+}
+
 /**
  * Parse VTT timestamp to seconds.
  * Supports formats:
@@ -18,6 +89,9 @@ export interface Segment {
  * - 00:00.000 (minutes:seconds.milliseconds)
  */
 function parseVttTimestamp(timestamp: string): number {
+  const fast = parseFixedWidthTimestamp(timestamp, 46); // '.'
+  if (fast !== null) return fast;
+
   const parts = timestamp.trim().split(':');
   let hours = 0;
   let minutes: number;
@@ -42,6 +116,9 @@ function parseVttTimestamp(timestamp: string): number {
  * Format: 00:00:00,000 (hours:minutes:seconds,milliseconds)
  */
 function parseSrtTimestamp(timestamp: string): number {
+  const fast = parseFixedWidthTimestamp(timestamp, 44); // ','
+  if (fast !== null) return fast;
+
   // SRT uses comma as decimal separator
   const normalized = timestamp.trim().replace(',', '.');
   const parts = normalized.split(':');
@@ -98,76 +175,39 @@ function deduplicateVttSegments(segments: Segment[]): Segment[] {
 }
 
 /**
- * Parse a VTT subtitle file.
+ * Parse VTT subtitle content.
  */
-export async function parseVtt(filePath: string): Promise<Segment[]> {
-  const content = await readFile(filePath, 'utf-8');
+export function parseVttContent(content: string): Segment[] {
   const segments: Segment[] = [];
 
-  const lines = content.split('\n');
-  let startIdx = 0;
-
-  // Find WEBVTT header
-  for (let i = 0; i < lines.length; i++) {
-    const line = lines[i].trim();
-    if (line === 'WEBVTT' || line.startsWith('WEBVTT ')) {
-      startIdx = i + 1;
-      break;
-    }
-  }
-
-  // Skip header metadata until first timestamp
-  while (startIdx < lines.length) {
-    const line = lines[startIdx].trim();
-    if (line.includes('-->')) break;
-    startIdx++;
-  }
+  // Cues start after the WEBVTT header line, or at the top if there is none
+  const header = VTT_HEADER_RE.exec(content);
+  VTT_CUE_RE.lastIndex = header ? header.index + header[0].length : 0;
 
-  // Parse cues
-  let i = startIdx;
-  while (i < lines.length) {
-    const line = lines[i].trim();
+  // Each match is a timestamp line plus the text lines up to the next
+  // blank line or timestamp line; header metadata and cue identifiers are
+  // never matched
+  let cue: RegExpExecArray | null;
+  while ((cue = VTT_CUE_RE.exec(content)) !== null) {
+    const timestampMatch = cue[1].match(VTT_TIMESTAMP_RE);
+    if (!timestampMatch) continue;
 
-    // Skip empty lines and cue identifiers
-    if (!line || (line && !line.includes('-->') && i + 1 < lines.length && lines[i + 1].includes('-->'))) {
-      i++;
-      continue;
-    }
+    const startTime = memoize(vttTimestampMemo, timestampMatch[1], parseVttTimestamp);
+    const endTime = memoize(vttTimestampMemo, timestampMatch[2], parseVttTimestamp);
 
-    // Look for timestamp line
-    if (line.includes('-->')) {
-      const timestampMatch = line.match(/([\d:.]+)\s*-->\s*([\d:.]+)/);
-      if (timestampMatch) {
-        const startTime = parseVttTimestamp(timestampMatch[1]);
-        const endTime = parseVttTimestamp(timestampMatch[2]);
-
-        // Collect text lines
-        const textLines: string[] = [];
-        i++;
-        while (i < lines.length) {
-          const textLine = lines[i];
-          // Stop at empty line or next timestamp
-          if (!textLine.trim()) break;
-          if (textLine.includes('-->')) {
-            i--;
-            break;
-          }
-          // Remove VTT formatting tags (like <c>, <00:00:00.000>, etc.)
-          const cleanLine = textLine.replace(/<[^>]+>/g, '').trim();
-          if (cleanLine) {
-            textLines.push(cleanLine);
-          }
-          i++;
-        }
-
-        const text = textLines.join(' ').trim();
-        if (text) {
-          segments.push({ text, start_time: startTime, end_time: endTime });
-        }
+    const textLines: string[] = [];
+    for (const textLine of cue[2].split('\n')) {
+      // Remove VTT formatting tags (like <c>, <00:00:00.000>, etc.)
+      const cleanLine = textLine.replace(TAG_RE, '').trim();
+      if (cleanLine) {
+        textLines.push(cleanLine);
       }
     }
 
-    i++;
+    const text = textLines.join(' ').trim();
+    if (text) {
+      segments.push({ text, start_time: startTime, end_time: endTime });
+    }
   }
 
   // Deduplicate rolling/scrolling text
@@ -175,82 +215,132 @@ export async function parseVtt(filePath: string): Promise<Segment[]> {
 }
 
 /**
- * Parse an SRT subtitle file.
+ * Parse SRT subtitle content.
  */
-export async function parseSrt(filePath: string): Promise<Segment[]> {
-  const content = await readFile(filePath, 'utf-8');
+export function parseSrtContent(content: string): Segment[] {
   const segments: Segment[] = [];
 
-  // Split by double newlines to get blocks
-  const blocks = content.trim().split(/\n\n+/);
+  // Blank lines separate blocks, so CRLF (or CR) line endings must be
+  // normalized first or a CRLF file would parse as a single block
+  const text = content.includes('\r') ? content.replace(LINE_ENDING_RE, '\n') : content;
 
-  for (const block of blocks) {
-    const lines = block.trim().split('\n');
-    if (lines.length < 2) continue;
+  // Walk blocks separated by blank lines without building a block array
+  const body = text.trim();
+  let start = 0;
+  while (start < body.length) {
+    let end = body.indexOf('\n\n', start);
+    if (end === -1) end = body.length;
 
-    // Find the timestamp line
-    let timestampIdx: number | null = null;
-    for (let idx = 0; idx < lines.length; idx++) {
-      if (lines[idx].includes('-->')) {
-        timestampIdx = idx;
-        break;
-      }
+    const segment = parseSrtBlock(body.slice(start, end));
+    if (segment) segments.push(segment);
+
+    // Skip the whole run of blank lines
+    start = end;
+    while (body.charCodeAt(start) === 10) start++;
+  }
+
+  return segments;
+}
+
+/**
+ * Parse a single SRT cue block (index, timestamp line, text lines).
+ */
+function parseSrtBlock(block: string): Segment | null {
+  const lines = block.trim().split('\n');
+  if (lines.length < 2) return null;
+
+  // Find the timestamp line
+  let timestampIdx: number | null = null;
+  for (let idx = 0; idx < lines.length; idx++) {
+    if (lines[idx].includes('-->')) {
+      timestampIdx = idx;
+      break;
     }
+  }
 
-    if (timestampIdx === null) continue;
+  if (timestampIdx === null) return null;
 
-    // Parse timestamp
-    const timestampLine = lines[timestampIdx];
-    const timestampMatch = timestampLine.match(/([\d:,]+)\s*-->\s*([\d:,]+)/);
-    if (!timestampMatch) continue;
+  // Parse timestamp
+  const timestampLine = lines[timestampIdx];
+  const timestampMatch = timestampLine.match(SRT_TIMESTAMP_RE);
+  if (!timestampMatch) return null;
 
-    const startTime = parseSrtTimestamp(timestampMatch[1]);
-    const endTime = parseSrtTimestamp(timestampMatch[2]);
+  const startTime = memoize(srtTimestampMemo, timestampMatch[1], parseSrtTimestamp);
+  const endTime = memoize(srtTimestampMemo, timestampMatch[2], parseSrtTimestamp);
 
-    // Text is everything after the timestamp line
-    const textLines = lines.slice(timestampIdx + 1);
-    let text = textLines.join(' ');
-    // Remove SRT formatting tags
-    text = text.replace(/<[^>]+>/g, '');
-    text = text.replace(/\{[^}]+\}/g, '');
-    text = text.trim();
+  // Text is everything after the timestamp line
+  const textLines = lines.slice(timestampIdx + 1);
+  let text = textLines.join(' ');
+  // Remove SRT formatting tags
+  text = text.replace(TAG_RE, '');
+  text = text.replace(CURLY_TAG_RE, '');
+  text = text.trim();
 
-    if (text) {
-      segments.push({ text, start_time: startTime, end_time: endTime });
-    }
-  }
+  return text ? { text, start_time: startTime, end_time: endTime } : null;
+}
 
-  return segments;
+/**
+ * Detect the subtitle format from the start of its content: a WEBVTT
+ * header, or an SRT cue index followed by a timestamp.
+ */
+function detectSubtitleFormat(head: string): 'vtt' | 'srt' | null {
+  if (head.trimStart().startsWith('WEBVTT')) return 'vtt';
+  if (SRT_DETECT_RE.test(head)) return 'srt';
+  return null;
 }
 
 /**
- * Auto-detect subtitle format and parse.
+ * Parse subtitle content already in memory, using its format extension
+ * (e.g. "vtt", "srt") or, failing that, its content to pick the parser.
  */
-export async function parseSubtitles(filePath: string): Promise<Segment[]> {
-  const suffix = filePath.toLowerCase().split('.').pop();
+export function parseSubtitleContent(content: string, ext: string): Segment[] {
+  const format = ext.toLowerCase();
 
-  if (suffix === 'vtt') {
-    return parseVtt(filePath);
-  } else if (suffix === 'srt') {
-    return parseSrt(filePath);
+  if (format === 'vtt') {
+    return parseVttContent(content);
+  } else if (format === 'srt') {
+    return parseSrtContent(content);
   } else {
-    // Try to detect from content
-    const content = await readFile(filePath, 'utf-8');
-    if (content.trim().startsWith('WEBVTT')) {
-      return parseVtt(filePath);
-    }
-    // Check for SRT pattern
-    if (/^\d+\s*\n\d{2}:\d{2}:\d{2},\d{3}/m.test(content)) {
-      return parseSrt(filePath);
+    const detected = detectSubtitleFormat(content.slice(0, SUBTITLE_SNIFF_CHARS));
+    if (detected === 'vtt') {
+      return parseVttContent(content);
+    } else if (detected === 'srt') {
+      return parseSrtContent(content);
     }
 
     throw new Error(
-      `Cannot determine subtitle format for ${filePath}. ` +
-      'Expected .vtt or .srt extension, or recognizable content.'
+      `Cannot determine subtitle format (${ext || 'unknown'}). ` +
+      'Expected vtt or srt, or recognizable content.'
     );
   }
 }
 
+/**
+ * parseSubtitleContent, with results kept in the persistent cache keyed
+ * by a hash of the content, so re-indexing a video skips the parse.
+ */
+export async function parseSubtitleContentCached(content: string, ext: string): Promise<Segment[]> {
+  const key = createHash('sha256')
+    .update(`${PARSE_CACHE_VERSION}\0${ext}\0`)
+    .update(content)
+    .digest('hex');
+  const cachePath = join(getCacheDir('segments'), `${key}.json`);
+  try {
+    const cached = JSON.parse(await readFile(cachePath, 'utf-8')) as Segment[];
+    const now = new Date();
+    await utimes(cachePath, now, now);
+    return cached;
+  } catch {}
+
+  const segments = parseSubtitleContent(content, ext);
+
+  try {
+    await mkdir(dirname(cachePath), { recursive: true });
+    await writeFile(cachePath, JSON.stringify(segments));
+  } catch {}
+  return segments;
+}
+
 /**
  * Transcribe audio using ElevenLabs Scribe.
  */
@@ -278,6 +368,14 @@ export async function transcribeAudio(audioPath: string): Promise<Segment[]> {
   return groupWordsIntoSegments(result);
 }
 
+/**
+ * Check whether text ends with '.', '!' or '?'.
+ */
+function endsSentence(text: string): boolean {
+  const last = text.charCodeAt(text.length - 1);
+  return last === 46 || last === 33 || last === 63;
+}
+
 /**
  * Group word-level timestamps into sentence segments.
  */
@@ -297,45 +395,33 @@ function groupWordsIntoSegments(transcriptionResult: any): Segment[] {
   }
 
   const words = transcriptionResult.words;
-  let currentSegmentWords: string[] = [];
-  let currentStart: number | null = null;
-
-  const sentenceEndings = new Set(['.', '!', '?']);
-
-  for (const word of words) {
-    const wordText = word.text || '';
-    const wordStart = word.start || 0;
-    const wordEnd = word.end || 0;
-
-    if (currentStart === null) {
-      currentStart = wordStart;
-    }
-
-    currentSegmentWords.push(wordText);
+  const texts: string[] = words.map((word: any) => word.text || '');
+  // Words first..i form the current sentence
+  let first = 0;
 
+  for (let i = 0; i < texts.length; i++) {
     // Check if this word ends a sentence
-    if (wordText && sentenceEndings.has(wordText[wordText.length - 1])) {
-      const text = currentSegmentWords.join(' ').trim();
-      if (text && currentStart !== null) {
+    if (endsSentence(texts[i])) {
+      const text = texts.slice(first, i + 1).join(' ').trim();
+      if (text) {
         segments.push({
           text,
-          start_time: currentStart,
-          end_time: wordEnd,
+          start_time: words[first].start || 0,
+          end_time: words[i].end || 0,
         });
       }
-      currentSegmentWords = [];
-      currentStart = null;
+      first = i + 1;
     }
   }
 
   // Handle remaining words
-  if (currentSegmentWords.length > 0) {
-    const text = currentSegmentWords.join(' ').trim();
-    if (text && currentStart !== null) {
+  if (first < texts.length) {
+    const text = texts.slice(first).join(' ').trim();
+    if (text) {
       const lastWord = words[words.length - 1];
       segments.push({
         text,
-        start_time: currentStart,
+        start_time: words[first].start || 0,
         end_time: lastWord.end ?? 0,
       });
     }
@@ -344,6 +430,13 @@ function groupWordsIntoSegments(transcriptionResult: any): Segment[] {
   return segments;
 }
 
+/**
+ * Collapse runs of whitespace to single spaces and trim.
+ */
+function collapseWhitespace(text: string): string {
+  return text.replace(WHITESPACE_RE, ' ').trim();
+}
+
 /**
  * Normalize and clean up transcript segments.
  */
@@ -354,12 +447,15 @@ export function normalizeSegments(
 ): Segment[] {
   if (segments.length === 0) return [];
 
-  const normalized: Segment[] = [];
+  // Keep cleaned segments as parallel arrays so the merge pass only builds
+  // one object per output segment
+  const texts: string[] = [];
+  const starts = new Float64Array(segments.length);
+  const ends = new Float64Array(segments.length);
 
   for (const segment of segments) {
     // Clean up text
-    let text = segment.text;
-    text = text.replace(/\s+/g, ' ').trim();
+    const text = memoize(cleanTextMemo, segment.text, collapseWhitespace);
 
     if (!text) continue;
 
@@ -375,45 +471,64 @@ export function normalizeSegments(
       }
     }
 
-    normalized.push({ text, start_time: startTime, end_time: endTime });
+    starts[texts.length] = startTime;
+    ends[texts.length] = endTime;
+    texts.push(text);
   }
 
   // Merge very short segments
   if (minDuration > 0) {
-    return mergeShortSegments(normalized, minDuration, mergeThreshold);
+    return mergeShortSegments(texts, starts, ends, minDuration, mergeThreshold);
   }
 
-  return normalized;
+  return texts.map((text, i) => ({ text, start_time: starts[i], end_time: ends[i] }));
 }
 
 /**
  * Merge segments that are too short with adjacent segments.
+ * Segment i is (texts[i], starts[i], ends[i]).
  */
 function mergeShortSegments(
-  segments: Segment[],
+  texts: string[],
+  starts: Float64Array,
+  ends: Float64Array,
   minDuration: number,
   mergeThreshold: number
 ): Segment[] {
-  if (segments.length === 0) return [];
+  if (texts.length === 0) return [];
 
   const result: Segment[] = [];
-  let current = { ...segments[0] };
+  // Segments first..i-1 form the current (possibly merged) segment
+  let first = 0;
 
-  for (let i = 1; i < segments.length; i++) {
-    const nextSeg = segments[i];
-    const currentDuration = current.end_time - current.start_time;
-    const gap = nextSeg.start_time - current.end_time;
+  for (let i = 1; i < texts.length; i++) {
+    const currentDuration = ends[i - 1] - starts[first];
+    const gap = starts[i] - ends[i - 1];
 
-    if (currentDuration < minDuration && gap <= mergeThreshold) {
-      // Merge with next segment
-      current.text = current.text + ' ' + nextSeg.text;
-      current.end_time = nextSeg.end_time;
-    } else {
-      result.push(current);
-      current = { ...nextSeg };
+    // Merge with next segment while the current one is short and close
+    if (!(currentDuration < minDuration && gap <= mergeThreshold)) {
+      result.push(mergedSegment(texts, starts, ends, first, i));
+      first = i;
     }
   }
 
-  result.push(current);
+  result.push(mergedSegment(texts, starts, ends, first, texts.length));
   return result;
 }
+
+/**
+ * Build one segment spanning segments first..end-1.
+ */
+function mergedSegment(
+  texts: string[],
+  starts: Float64Array,
+  ends: Float64Array,
+  first: number,
+  end: number
+): Segment {
+  return {
+    text: end - first === 1 ? texts[first] : texts.slice(first, end).join(' '),
+    start_time: starts[first],
+    end_time: ends[end - 1],
+  };
+}